@@ -4,16 +4,19 @@ from .models import Customer, Loan, TaskExecution
 
 @admin.register(Customer)
 class CustomerAdmin(admin.ModelAdmin):
-    list_display = ('user', 'phone', 'created_at')
-    search_fields = ('user__username', 'phone')
+    list_display = ('username', 'phone', 'created_at')
+    search_fields = ('username', 'phone')
+    raw_id_fields = ('user',)
 
 
 @admin.register(Loan)
 class LoanAdmin(admin.ModelAdmin):
-    list_display = ('id', 'customer', 'amount', 'status', 'current_task', 'created_at')
+    list_display = ('id', 'customer', 'amount_cents', 'status', 'current_task_type', 'created_at')
     list_filter = ('status', 'is_active', 'created_at')
-    search_fields = ('customer__user__username', 'id')
+    search_fields = ('customer__username', 'id')
     readonly_fields = ('created_at',)
+    list_select_related = ('customer',)
+    raw_id_fields = ('customer', 'current_task')
 
 
 @admin.register(TaskExecution)
@@ -22,3 +25,5 @@ class TaskExecutionAdmin(admin.ModelAdmin):
     list_filter = ('task_type', 'is_completed', 'started_at')
     search_fields = ('loan__id', 'task_type')
     readonly_fields = ('started_at',)
+    list_select_related = ('loan',)
+    raw_id_fields = ('loan',)
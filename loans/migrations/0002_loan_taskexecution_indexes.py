@@ -0,0 +1,27 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('loans', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='loan',
+            index=models.Index(fields=['customer', 'is_active', 'status'], name='loan_cust_active_status_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='loan',
+            index=models.Index(fields=['-created_at'], name='loan_created_at_desc_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='taskexecution',
+            index=models.Index(fields=['loan', 'is_completed'], name='task_loan_completed_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='taskexecution',
+            index=models.Index(fields=['task_type', 'is_completed'], name='task_type_completed_idx'),
+        ),
+    ]
@@ -0,0 +1,26 @@
+from django.db import migrations, models
+
+
+def populate_username(apps, schema_editor):
+    Customer = apps.get_model('loans', 'Customer')
+    customers = list(Customer.objects.select_related('user'))
+    for customer in customers:
+        customer.username = customer.user.username
+    Customer.objects.bulk_update(customers, ['username'], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('loans', '0003_loan_updated_at'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='customer',
+            name='username',
+            field=models.CharField(db_index=True, default='', editable=False, max_length=150),
+            preserve_default=False,
+        ),
+        migrations.RunPython(populate_username, migrations.RunPython.noop),
+    ]
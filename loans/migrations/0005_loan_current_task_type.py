@@ -0,0 +1,25 @@
+from django.db import migrations, models
+
+
+def populate_current_task_type(apps, schema_editor):
+    Loan = apps.get_model('loans', 'Loan')
+    loans = list(Loan.objects.filter(current_task__isnull=False).select_related('current_task'))
+    for loan in loans:
+        loan.current_task_type = loan.current_task.task_type
+    Loan.objects.bulk_update(loans, ['current_task_type'], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('loans', '0004_customer_username'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='loan',
+            name='current_task_type',
+            field=models.CharField(blank=True, choices=[('KYC', 'KYC'), ('CREDIT_CHECK', 'Credit Check'), ('DISBURSEMENT', 'Disbursement')], default='', max_length=30),
+        ),
+        migrations.RunPython(populate_current_task_type, migrations.RunPython.noop),
+    ]
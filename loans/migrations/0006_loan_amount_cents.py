@@ -0,0 +1,47 @@
+from decimal import Decimal
+
+from django.db import migrations, models
+
+
+def amount_to_cents(apps, schema_editor):
+    Loan = apps.get_model('loans', 'Loan')
+    loans = list(Loan.objects.only('id', 'amount'))
+    for loan in loans:
+        loan.amount_cents = int(loan.amount * 100)
+    Loan.objects.bulk_update(loans, ['amount_cents'], batch_size=500)
+
+
+def cents_to_amount(apps, schema_editor):
+    Loan = apps.get_model('loans', 'Loan')
+    loans = list(Loan.objects.only('id', 'amount_cents'))
+    for loan in loans:
+        loan.amount = Decimal(loan.amount_cents) / 100
+    Loan.objects.bulk_update(loans, ['amount'], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('loans', '0005_loan_current_task_type'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='loan',
+            name='amount_cents',
+            field=models.BigIntegerField(default=0),
+            preserve_default=False,
+        ),
+        # nullable before removal, so reversing re-adds a column that
+        # cents_to_amount can fill before NOT NULL is restored
+        migrations.AlterField(
+            model_name='loan',
+            name='amount',
+            field=models.DecimalField(decimal_places=2, max_digits=10, null=True),
+        ),
+        migrations.RunPython(amount_to_cents, cents_to_amount),
+        migrations.RemoveField(
+            model_name='loan',
+            name='amount',
+        ),
+    ]
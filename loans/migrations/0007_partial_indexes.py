@@ -0,0 +1,19 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('loans', '0006_loan_amount_cents'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='loan',
+            index=models.Index(condition=models.Q(('is_active', True), ('status', 'IN_PROGRESS')), fields=['customer', '-created_at'], name='loan_active_inprog_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='taskexecution',
+            index=models.Index(condition=models.Q(('is_completed', False)), fields=['loan', 'task_type'], name='task_open_loan_type_idx'),
+        ),
+    ]
@@ -0,0 +1,16 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('loans', '0007_partial_indexes'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='loan',
+            name='current_task_type',
+            field=models.CharField(blank=True, choices=[('KYC', 'KYC'), ('CREDIT_CHECK', 'Credit Check'), ('DISBURSEMENT', 'Disbursement')], default='', editable=False, max_length=30),
+        ),
+    ]
@@ -2,13 +2,39 @@ from django.db import models
 from django.contrib.auth.models import User
 
 
+TASK_TYPE_CHOICES = (
+    ("KYC", "KYC"),
+    ("CREDIT_CHECK", "Credit Check"),
+    ("DISBURSEMENT", "Disbursement"),
+)
+
+
 class Customer(models.Model):
     user = models.OneToOneField(User, on_delete=models.CASCADE)
+    # denormalized copy of user.username, kept in sync by loans.signals
+    username = models.CharField(max_length=150, db_index=True, editable=False)
     phone = models.CharField(max_length=15)
     created_at = models.DateTimeField(auto_now_add=True)
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_user_id = instance.__dict__.get("user_id")
+        return instance
+
+    def save(self, *args, **kwargs):
+        # copy only for new customers or a reassigned user, so a plain save
+        # never has to fetch auth_user
+        if self.user_id != getattr(self, "_loaded_user_id", None):
+            self.username = self.user.username
+            update_fields = kwargs.get("update_fields")
+            if update_fields is not None:
+                kwargs["update_fields"] = {*update_fields, "username"}
+        super().save(*args, **kwargs)
+        self._loaded_user_id = self.user_id
+
     def __str__(self):
-        return self.user.username
+        return self.username
 
 
 class Loan(models.Model):
@@ -20,7 +46,8 @@ class Loan(models.Model):
     )
 
     customer = models.ForeignKey(Customer, on_delete=models.CASCADE)
-    amount = models.DecimalField(max_digits=10, decimal_places=2)
+    # stored in minor units (paise/cents) to keep arithmetic on ints
+    amount_cents = models.BigIntegerField()
     tenure_months = models.IntegerField()
     status = models.CharField(max_length=20, choices=STATUS_CHOICES, default="NEW")
 
@@ -32,20 +59,61 @@ class Loan(models.Model):
         on_delete=models.SET_NULL,
         related_name="active_loans",
     )
+    # denormalized current_task.task_type for list/admin display; derived in
+    # save() and cleared by loans.signals when the task is deleted
+    current_task_type = models.CharField(
+        max_length=30,
+        choices=TASK_TYPE_CHOICES,
+        blank=True,
+        default="",
+        editable=False,
+    )
 
     is_active = models.BooleanField(default=True)
     created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["customer", "is_active", "status"], name="loan_cust_active_status_idx"),
+            models.Index(fields=["-created_at"], name="loan_created_at_desc_idx"),
+            models.Index(fields=["updated_at"], name="loan_updated_at_idx"),
+            # operator dashboards: only active, in-progress loans are indexed
+            models.Index(
+                fields=["customer", "-created_at"],
+                condition=models.Q(is_active=True, status="IN_PROGRESS"),
+                name="loan_active_inprog_idx",
+            ),
+        ]
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_current_task_id = instance.__dict__.get("current_task_id")
+        return instance
+
+    def save(self, *args, **kwargs):
+        update_fields = kwargs.get("update_fields")
+        # update_fields may name the FK either way
+        writes_current_task = update_fields is None or bool(
+            {"current_task", "current_task_id"} & set(update_fields)
+        )
+        if writes_current_task and self.current_task_id != getattr(self, "_loaded_current_task_id", None):
+            self.current_task_type = self.current_task.task_type if self.current_task_id else ""
+            if update_fields is not None:
+                kwargs["update_fields"] = {*update_fields, "current_task_type"}
+        super().save(*args, **kwargs)
+        # only advance the snapshot once current_task has actually been written
+        if writes_current_task:
+            self._loaded_current_task_id = self.current_task_id
 
     def __str__(self):
-        return f"Loan {self.id} - {self.customer}"
+        # customer_id lives on the loan row, so this never hits the database
+        return f"Loan {self.id} - customer {self.customer_id}"
 
 
 class TaskExecution(models.Model):
-    TASK_TYPE_CHOICES = (
-        ("KYC", "KYC"),
-        ("CREDIT_CHECK", "Credit Check"),
-        ("DISBURSEMENT", "Disbursement"),
-    )
+    TASK_TYPE_CHOICES = TASK_TYPE_CHOICES
 
     loan = models.ForeignKey(
         Loan,
@@ -57,5 +125,16 @@ class TaskExecution(models.Model):
     started_at = models.DateTimeField(auto_now_add=True)
     completed_at = models.DateTimeField(null=True, blank=True)
 
+    class Meta:
+        indexes = [
+            models.Index(fields=["loan", "is_completed"], name="task_loan_completed_idx"),
+            models.Index(fields=["task_type", "is_completed"], name="task_type_completed_idx"),
+            models.Index(
+                fields=["loan", "task_type"],
+                condition=models.Q(is_completed=False),
+                name="task_open_loan_type_idx",
+            ),
+        ]
+
     def __str__(self):
         return f"{self.task_type} for Loan {self.loan_id}"
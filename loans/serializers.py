@@ -5,18 +5,76 @@ from .models import Loan, TaskExecution, Customer
 class TaskExecutionSerializer(serializers.ModelSerializer):
     class Meta:
         model = TaskExecution
-        fields = "__all__"
+        fields = ("id", "loan", "task_type", "is_completed", "started_at", "completed_at")
+        read_only_fields = ("loan", "is_completed", "completed_at")
+
+
+class TaskCreateSerializer(serializers.Serializer):
+    loan_id = serializers.IntegerField()
+    task_type = serializers.ChoiceField(choices=TaskExecution.TASK_TYPE_CHOICES)
+
+
+class TaskCompleteSerializer(serializers.Serializer):
+    task_id = serializers.IntegerField()
+
+
+class LoanTransitionSerializer(serializers.Serializer):
+    id = serializers.IntegerField()
+    status = serializers.ChoiceField(choices=Loan.STATUS_CHOICES)
+    is_active = serializers.BooleanField()
+
+
+class LoanBulkTransitionSerializer(serializers.Serializer):
+    ids = serializers.ListField(child=serializers.IntegerField(), allow_empty=False)
+    status = serializers.ChoiceField(choices=Loan.STATUS_CHOICES)
+    is_active = serializers.BooleanField(required=False)
 
 
 class LoanSerializer(serializers.ModelSerializer):
-    tasks = TaskExecutionSerializer(many=True, read_only=True)
+    RECENT_TASKS_LIMIT = 3
+
+    recent_tasks = serializers.SerializerMethodField()
 
     class Meta:
         model = Loan
-        fields = "__all__"
+        fields = (
+            "id",
+            "customer",
+            "amount_cents",
+            "tenure_months",
+            "status",
+            "current_task",
+            "current_task_type",
+            "is_active",
+            "created_at",
+            "updated_at",
+            "recent_tasks",
+        )
+        read_only_fields = ("current_task", "current_task_type")
+
+    def get_recent_tasks(self, obj):
+        # list views attach recent_tasks through a windowed Prefetch
+        tasks = getattr(obj, "recent_tasks", None)
+        if tasks is None:
+            tasks = obj.tasks.order_by("-started_at", "-id")[: self.RECENT_TASKS_LIMIT]
+        return TaskExecutionSerializer(tasks, many=True).data
+
+
+class LoanCreateSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = Loan
+        fields = ("customer", "amount_cents", "tenure_months")
+
+
+class LoanDetailSerializer(LoanSerializer):
+    tasks = TaskExecutionSerializer(many=True, read_only=True)
+
+    class Meta(LoanSerializer.Meta):
+        # tasks is fully expanded here, so recent_tasks would only repeat it
+        fields = tuple(f for f in LoanSerializer.Meta.fields if f != "recent_tasks") + ("tasks",)
 
 
 class CustomerSerializer(serializers.ModelSerializer):
     class Meta:
         model = Customer
-        fields = "__all__"
+        fields = ("id", "user", "username", "phone", "created_at")
@@ -0,0 +1,37 @@
+from django.contrib.auth.models import User
+from django.db.models import Case, F, Value, When
+from django.db.models.signals import post_save, pre_delete
+from django.dispatch import receiver
+from django.utils import timezone
+
+from .models import Customer, Loan, TaskExecution
+
+
+@receiver(post_save, sender=User)
+def sync_customer_username(sender, instance, created, update_fields=None, **kwargs):
+    # new users have no customer yet; last_login-style saves can't rename
+    if created or (update_fields is not None and "username" not in update_fields):
+        return
+    Customer.objects.filter(user=instance).exclude(username=instance.username).update(
+        username=instance.username
+    )
+
+
+@receiver(post_save, sender=TaskExecution)
+def touch_loan_on_task_save(sender, instance, **kwargs):
+    # the loan list ETag only sees Loan.updated_at; update()/bulk_create()
+    # paths skip this signal and bump the loan themselves
+    Loan.objects.filter(id=instance.loan_id).update(updated_at=timezone.now())
+
+
+@receiver(pre_delete, sender=TaskExecution)
+def touch_loan_on_task_delete(sender, instance, **kwargs):
+    # single UPDATE: bump the ETag and, since on_delete=SET_NULL is about to
+    # clear current_task, drop its denormalized type too
+    Loan.objects.filter(id=instance.loan_id).update(
+        updated_at=timezone.now(),
+        current_task_type=Case(
+            When(current_task=instance.id, then=Value("")),
+            default=F("current_task_type"),
+        ),
+    )
@@ -1,3 +1,5 @@
+import json
+
 from django.test import TestCase
 from django.contrib.auth.models import User
 from .models import Customer, Loan, TaskExecution
@@ -20,17 +22,27 @@ class LoanModelTests(TestCase):
     def test_loan_creation(self):
         loan = Loan.objects.create(
             customer=self.customer,
-            amount=100000.00,
+            amount_cents=10000000,
             tenure_months=12,
             status="NEW"
         )
         self.assertEqual(loan.status, "NEW")
         self.assertEqual(loan.customer, self.customer)
+
+    def test_loan_str_does_not_query(self):
+        loan = Loan.objects.create(
+            customer=self.customer,
+            amount_cents=10000000,
+            tenure_months=12,
+        )
+        loan = Loan.objects.get(id=loan.id)
+        with self.assertNumQueries(0):
+            self.assertEqual(str(loan), f"Loan {loan.id} - customer {self.customer.id}")
     
     def test_task_creation(self):
         loan = Loan.objects.create(
             customer=self.customer,
-            amount=100000.00,
+            amount_cents=10000000,
             tenure_months=12,
         )
         task = TaskExecution.objects.create(
@@ -39,3 +51,301 @@ class LoanModelTests(TestCase):
         )
         self.assertEqual(task.is_completed, False)
         self.assertEqual(task.loan, loan)
+
+    def test_customer_username_follows_user(self):
+        self.assertEqual(self.customer.username, 'testuser')
+        self.user.username = 'renamed'
+        self.user.save()
+        self.customer.refresh_from_db()
+        self.assertEqual(self.customer.username, 'renamed')
+
+    def test_customer_save_does_not_fetch_user(self):
+        customer = Customer.objects.get(id=self.customer.id)
+        with self.assertNumQueries(1):
+            customer.phone = '8888888888'
+            customer.save()
+
+    def test_customer_username_follows_reassigned_user(self):
+        other = User.objects.create_user(username='otheruser', password='testpass123')
+        self.customer.user = other
+        self.customer.save()
+        self.customer.refresh_from_db()
+        self.assertEqual(self.customer.username, 'otheruser')
+
+
+class LoanListViewTests(TestCase):
+    """Query-count checks for the loan list endpoint"""
+
+    def setUp(self):
+        for i in range(3):
+            user = User.objects.create_user(username=f'user{i}', password='testpass123')
+            customer = Customer.objects.create(user=user, phone='9999999999')
+            loan = Loan.objects.create(customer=customer, amount_cents=100000, tenure_months=12)
+            TaskExecution.objects.create(loan=loan, task_type="KYC")
+
+    def test_list_query_count_is_constant(self):
+        # etag aggregate (also the page count) + loan rows + recent tasks
+        with self.assertNumQueries(3):
+            response = self.client.get('/api/loans/')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['count'], 3)
+        self.assertEqual(len(response.json()['results']), 3)
+
+    def test_unchanged_list_returns_304(self):
+        etag = self.client.get('/api/loans/')['ETag']
+        with self.assertNumQueries(1):
+            response = self.client.get('/api/loans/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response['ETag'], etag)
+
+    def test_new_task_changes_etag(self):
+        etag = self.client.get('/api/loans/')['ETag']
+        loan = Loan.objects.first()
+        self.client.post(
+            '/api/tasks/create/',
+            {'loan_id': loan.id, 'task_type': 'CREDIT_CHECK'},
+            content_type='application/json',
+        )
+        response = self.client.get('/api/loans/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+
+    def test_completed_task_changes_etag(self):
+        etag = self.client.get('/api/loans/')['ETag']
+        task = TaskExecution.objects.first()
+        self.client.post(
+            '/api/tasks/complete/',
+            {'task_id': task.id},
+            content_type='application/json',
+        )
+        response = self.client.get('/api/loans/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+
+    def test_orm_created_task_changes_etag(self):
+        etag = self.client.get('/api/loans/')['ETag']
+        TaskExecution.objects.create(loan=Loan.objects.first(), task_type="DISBURSEMENT")
+        response = self.client.get('/api/loans/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+
+    def test_deleted_task_changes_etag(self):
+        etag = self.client.get('/api/loans/')['ETag']
+        TaskExecution.objects.first().delete()
+        response = self.client.get('/api/loans/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+
+    def test_create_ignores_workflow_fields(self):
+        customer = Customer.objects.first()
+        response = self.client.post(
+            '/api/loans/',
+            {'customer': customer.id, 'amount_cents': 500000, 'tenure_months': 24, 'status': 'COMPLETED'},
+            content_type='application/json',
+        )
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.json()['status'], "NEW")
+        self.assertEqual(response.json()['recent_tasks'], [])
+
+    def test_list_filters_by_status(self):
+        Loan.objects.filter(customer__user__username='user0').update(status="REJECTED")
+        response = self.client.get('/api/loans/', {'status': 'REJECTED'})
+        self.assertEqual(response.json()['count'], 1)
+
+
+class TaskViewTests(TestCase):
+    """Tests for the task workflow endpoints"""
+
+    def setUp(self):
+        user = User.objects.create_user(username='taskuser', password='testpass123')
+        self.customer = Customer.objects.create(user=user, phone='9999999999')
+        self.loan = Loan.objects.create(customer=self.customer, amount_cents=100000, tenure_months=12)
+
+    def test_create_task_sets_current_task(self):
+        response = self.client.post(
+            '/api/tasks/create/',
+            {'loan_id': self.loan.id, 'task_type': 'KYC'},
+            content_type='application/json',
+        )
+        self.assertEqual(response.status_code, 200)
+        self.loan.refresh_from_db()
+        self.assertEqual(self.loan.status, "IN_PROGRESS")
+        self.assertEqual(self.loan.current_task.task_type, "KYC")
+        self.assertEqual(self.loan.current_task_type, "KYC")
+
+    def test_create_task_rejects_unknown_task_type(self):
+        response = self.client.post(
+            '/api/tasks/create/',
+            {'loan_id': self.loan.id, 'task_type': 'BOGUS'},
+            content_type='application/json',
+        )
+        self.assertEqual(response.status_code, 400)
+        self.assertFalse(TaskExecution.objects.exists())
+
+    def test_current_task_type_follows_current_task(self):
+        task = TaskExecution.objects.create(loan=self.loan, task_type="CREDIT_CHECK")
+        self.loan.current_task = task
+        self.loan.save()
+        self.assertEqual(self.loan.current_task_type, "CREDIT_CHECK")
+        task.delete()
+        self.loan.refresh_from_db()
+        self.assertIsNone(self.loan.current_task)
+        self.assertEqual(self.loan.current_task_type, "")
+
+    def test_current_task_type_survives_partial_saves(self):
+        task = TaskExecution.objects.create(loan=self.loan, task_type="DISBURSEMENT")
+        loan = Loan.objects.get(id=self.loan.id)
+        loan.current_task = task
+        loan.save(update_fields=["status"])
+        loan.save(update_fields=["current_task_id"])
+        loan.refresh_from_db()
+        self.assertEqual(loan.current_task_id, task.id)
+        self.assertEqual(loan.current_task_type, "DISBURSEMENT")
+
+    def test_create_task_with_non_numeric_loan_id_returns_400(self):
+        response = self.client.post(
+            '/api/tasks/create/',
+            {'loan_id': 'abc', 'task_type': 'KYC'},
+            content_type='application/json',
+        )
+        self.assertEqual(response.status_code, 400)
+
+    def test_complete_task_with_non_numeric_id_returns_400(self):
+        response = self.client.post(
+            '/api/tasks/complete/',
+            {'task_id': 'abc'},
+            content_type='application/json',
+        )
+        self.assertEqual(response.status_code, 400)
+
+    def test_create_task_for_missing_loan_returns_404(self):
+        response = self.client.post(
+            '/api/tasks/create/',
+            {'loan_id': self.loan.id + 100, 'task_type': 'KYC'},
+            content_type='application/json',
+        )
+        self.assertEqual(response.status_code, 404)
+        self.assertFalse(TaskExecution.objects.exists())
+
+    def test_bulk_create_sets_last_task_as_current(self):
+        other = Loan.objects.create(customer=self.customer, amount_cents=200000, tenure_months=6)
+        response = self.client.post(
+            '/api/tasks/bulk-create/',
+            [
+                {'loan_id': self.loan.id, 'task_type': 'KYC'},
+                {'loan_id': self.loan.id, 'task_type': 'CREDIT_CHECK'},
+                {'loan_id': other.id, 'task_type': 'KYC'},
+            ],
+            content_type='application/json',
+        )
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(TaskExecution.objects.count(), 3)
+        self.loan.refresh_from_db()
+        other.refresh_from_db()
+        self.assertEqual(self.loan.current_task.task_type, "CREDIT_CHECK")
+        self.assertEqual(self.loan.current_task_type, "CREDIT_CHECK")
+        self.assertEqual(other.status, "IN_PROGRESS")
+
+    def test_bulk_create_with_missing_loan_creates_nothing(self):
+        response = self.client.post(
+            '/api/tasks/bulk-create/',
+            [{'loan_id': self.loan.id + 100, 'task_type': 'KYC'}],
+            content_type='application/json',
+        )
+        self.assertEqual(response.status_code, 404)
+        self.assertFalse(TaskExecution.objects.exists())
+
+    def test_complete_task_sets_completed_at(self):
+        task = TaskExecution.objects.create(loan=self.loan, task_type="KYC")
+        response = self.client.post(
+            '/api/tasks/complete/',
+            {'task_id': task.id},
+            content_type='application/json',
+        )
+        self.assertEqual(response.status_code, 200)
+        task.refresh_from_db()
+        self.assertTrue(task.is_completed)
+        self.assertIsNotNone(task.completed_at)
+
+    def test_complete_missing_task_returns_404(self):
+        response = self.client.post(
+            '/api/tasks/complete/',
+            {'task_id': 12345},
+            content_type='application/json',
+        )
+        self.assertEqual(response.status_code, 404)
+
+
+class LoanDetailViewTests(TestCase):
+    """Tests for list vs detail task representations"""
+
+    def setUp(self):
+        user = User.objects.create_user(username='detailuser', password='testpass123')
+        customer = Customer.objects.create(user=user, phone='9999999999')
+        self.loan = Loan.objects.create(customer=customer, amount_cents=100000, tenure_months=12)
+        self.task = TaskExecution.objects.create(loan=self.loan, task_type="KYC")
+
+    def test_list_returns_recent_tasks_only(self):
+        row = self.client.get('/api/loans/').json()['results'][0]
+        self.assertNotIn('tasks', row)
+        self.assertEqual([t['id'] for t in row['recent_tasks']], [self.task.id])
+
+    def test_list_caps_recent_tasks(self):
+        for task_type in ("CREDIT_CHECK", "DISBURSEMENT", "KYC"):
+            TaskExecution.objects.create(loan=self.loan, task_type=task_type)
+        row = self.client.get('/api/loans/').json()['results'][0]
+        self.assertEqual(len(row['recent_tasks']), 3)
+        self.assertNotIn(self.task.id, [t['id'] for t in row['recent_tasks']])
+
+    def test_detail_expands_tasks(self):
+        response = self.client.get(f'/api/loans/{self.loan.id}/')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['tasks'][0]['task_type'], "KYC")
+        self.assertNotIn('recent_tasks', response.json())
+
+
+class LoanExportViewTests(TestCase):
+    """Tests for the streaming loan export endpoint"""
+
+    def setUp(self):
+        user = User.objects.create_user(username='exportuser', password='testpass123')
+        customer = Customer.objects.create(user=user, phone='9999999999')
+        self.loan = Loan.objects.create(customer=customer, amount_cents=100000, tenure_months=12)
+        self.task = TaskExecution.objects.create(loan=self.loan, task_type="KYC")
+
+    def test_export_streams_all_loans(self):
+        response = self.client.get('/api/loans/export/')
+        self.assertEqual(response.status_code, 200)
+        rows = json.loads(b''.join(response.streaming_content))
+        self.assertEqual(len(rows), 1)
+        self.assertEqual([t['id'] for t in rows[0]['recent_tasks']], [self.task.id])
+
+
+class LoanBulkTransitionViewTests(TestCase):
+    """Tests for the batched loan status transition endpoint"""
+
+    def setUp(self):
+        user = User.objects.create_user(username='transitionuser', password='testpass123')
+        self.customer = Customer.objects.create(user=user, phone='9999999999')
+        self.loan = Loan.objects.create(customer=self.customer, amount_cents=100000, tenure_months=12)
+
+    def test_bulk_transition_updates_all_loans(self):
+        other = Loan.objects.create(customer=self.customer, amount_cents=200000, tenure_months=6)
+        response = self.client.post(
+            '/api/loans/bulk-transition/',
+            {'ids': [self.loan.id, other.id], 'status': 'COMPLETED', 'is_active': False},
+            content_type='application/json',
+        )
+        self.assertEqual(response.json()['updated'], 2)
+        self.assertFalse(Loan.objects.filter(is_active=True).exists())
+        self.assertEqual(Loan.objects.filter(status="COMPLETED").count(), 2)
+
+    def test_bulk_transition_per_loan_values(self):
+        other = Loan.objects.create(customer=self.customer, amount_cents=200000, tenure_months=6)
+        response = self.client.post(
+            '/api/loans/bulk-transition/',
+            [
+                {'id': self.loan.id, 'status': 'COMPLETED', 'is_active': False},
+                {'id': other.id, 'status': 'REJECTED', 'is_active': False},
+            ],
+            content_type='application/json',
+        )
+        self.assertEqual(response.json()['updated'], 2)
+        other.refresh_from_db()
+        self.assertEqual(other.status, "REJECTED")
@@ -1,8 +1,20 @@
 from django.urls import path
-from .views import LoanListCreateView, TaskCreateView, TaskCompleteView
+from .views import (
+    LoanListCreateView,
+    LoanDetailView,
+    LoanBulkTransitionView,
+    LoanExportView,
+    TaskCreateView,
+    TaskBulkCreateView,
+    TaskCompleteView,
+)
 
 urlpatterns = [
     path("loans/", LoanListCreateView.as_view(), name="loan-list-create"),
+    path("loans/export/", LoanExportView.as_view(), name="loan-export"),
+    path("loans/bulk-transition/", LoanBulkTransitionView.as_view(), name="loan-bulk-transition"),
+    path("loans/<int:pk>/", LoanDetailView.as_view(), name="loan-detail"),
     path("tasks/create/", TaskCreateView.as_view(), name="task-create"),
+    path("tasks/bulk-create/", TaskBulkCreateView.as_view(), name="task-bulk-create"),
     path("tasks/complete/", TaskCompleteView.as_view(), name="task-complete"),
 ]
@@ -1,28 +1,248 @@
+import hashlib
+import json
+from collections import defaultdict
+
 from rest_framework.views import APIView
 from rest_framework.response import Response
-from rest_framework import status
+from rest_framework import generics, status
+from rest_framework.exceptions import NotFound, ValidationError
+from rest_framework.filters import OrderingFilter
+from rest_framework.pagination import DjangoPaginator, PageNumberPagination
+from rest_framework.utils.encoders import JSONEncoder
+from django.db import transaction
+from django.db.models import Count, F, Max, Prefetch, Window
+from django.db.models.functions import RowNumber
+from django.shortcuts import get_object_or_404
+from django.http import HttpResponseNotModified, StreamingHttpResponse
+from django.utils import timezone
+from django.utils.http import parse_etags, quote_etag
 
 from .models import Loan, TaskExecution
-from .serializers import LoanSerializer
+from .serializers import (
+    LoanBulkTransitionSerializer,
+    LoanCreateSerializer,
+    LoanDetailSerializer,
+    LoanSerializer,
+    LoanTransitionSerializer,
+    TaskCompleteSerializer,
+    TaskCreateSerializer,
+)
+
+
+def recent_tasks_queryset(limit=LoanSerializer.RECENT_TASKS_LIMIT):
+    """
+    At most `limit` newest tasks per loan, ranked with ROW_NUMBER().
+    """
+    return (
+        TaskExecution.objects.annotate(
+            row_number=Window(
+                RowNumber(),
+                partition_by=F("loan_id"),
+                order_by=[F("started_at").desc(), F("id").desc()],
+            )
+        )
+        .filter(row_number__lte=limit)
+        .order_by("-started_at", "-id")
+    )
+
+
+def recent_tasks_prefetch(limit=LoanSerializer.RECENT_TASKS_LIMIT):
+    """
+    Prefetch at most `limit` newest tasks per loan into `recent_tasks`.
+    """
+    return Prefetch("tasks", queryset=recent_tasks_queryset(limit), to_attr="recent_tasks")
+
+
+class LoanPagination(PageNumberPagination):
+    page_size = 50
+    page_size_query_param = "page_size"
+    max_page_size = 200
+    known_count = None
+
+    def paginate_queryset(self, queryset, request, view=None, count=None):
+        # callers that already counted the rows can skip the paginator's COUNT(*)
+        self.known_count = count
+        return super().paginate_queryset(queryset, request, view)
+
+    def django_paginator_class(self, object_list, per_page):
+        paginator = DjangoPaginator(object_list, per_page)
+        if self.known_count is not None:
+            paginator.count = self.known_count
+        return paginator
+
+
+class LoanListCreateView(generics.ListCreateAPIView):
+    """
+    List loans (paginated, filterable by status / is_active / customer)
+    or create a new loan.
+
+    """
+
+    queryset = Loan.objects.all()
+    serializer_class = LoanSerializer
+    pagination_class = LoanPagination
+    filter_backends = [OrderingFilter]
+    ordering_fields = ["id", "created_at", "amount_cents"]
+    ordering = ["-created_at", "-id"]
+    filter_fields = ("status", "is_active", "customer")
+    list_values = (
+        "id",
+        "customer_id",
+        "amount_cents",
+        "tenure_months",
+        "status",
+        "current_task_id",
+        "current_task_type",
+        "is_active",
+        "created_at",
+        "updated_at",
+    )
+    task_values = ("id", "loan_id", "task_type", "is_completed", "started_at", "completed_at")
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        # push the simple equality filters down into SQL
+        for field in self.filter_fields:
+            value = self.request.query_params.get(field)
+            if value is None:
+                continue
+            if field == "is_active":
+                value = value.lower() in ("1", "true", "yes")
+            try:
+                queryset = queryset.filter(**{field: value})
+            except (TypeError, ValueError):
+                raise ValidationError({field: "Invalid value."})
+        return queryset
+
+    def get_serializer_class(self):
+        if self.request.method == "POST":
+            return LoanCreateSerializer
+        return LoanSerializer
+
+    def create(self, request, *args, **kwargs):
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        loan = serializer.save()
+        return Response(LoanSerializer(loan).data, status=status.HTTP_201_CREATED)
+
+    def list(self, request, *args, **kwargs):
+        # cheap fingerprint of the filtered set; unchanged data short-circuits
+        # before any rows are loaded or serialized
+        queryset = self.filter_queryset(self.get_queryset())
+        agg = queryset.order_by().aggregate(m=Max("updated_at"), c=Count("id"))
+        etag = quote_etag(
+            hashlib.md5(
+                f"{request.get_full_path()}-{agg['m']}-{agg['c']}".encode()
+            ).hexdigest()
+        )
+        if_none_match = request.META.get("HTTP_IF_NONE_MATCH")
+        if if_none_match and etag in parse_etags(if_none_match):
+            response = HttpResponseNotModified()
+            response["ETag"] = etag
+            return response
+
+        # read path skips LoanSerializer: plain dicts from .values(), with
+        # recent_tasks stitched in from one bounded, batched query; the page
+        # reuses the aggregate's row count instead of a second COUNT(*)
+        page = self.paginator.paginate_queryset(
+            queryset.values(*self.list_values), request, view=self, count=agg["c"]
+        )
+        rows = page if page is not None else list(queryset.values(*self.list_values))
+        self.attach_tasks(rows)
+
+        if page is not None:
+            response = self.get_paginated_response(rows)
+        else:
+            response = Response(rows)
+        response["ETag"] = etag
+        return response
+
+    def attach_tasks(self, rows):
+        loan_ids = [row["id"] for row in rows]
+
+        recent_tasks = defaultdict(list)
+        recent = recent_tasks_queryset().filter(loan_id__in=loan_ids)
+        for task in recent.values(*self.task_values):
+            task["loan"] = task.pop("loan_id")
+            recent_tasks[task["loan"]].append(task)
 
+        # keep the key names LoanSerializer uses
+        for row in rows:
+            row["customer"] = row.pop("customer_id")
+            row["current_task"] = row.pop("current_task_id")
+            row["recent_tasks"] = recent_tasks[row["id"]]
 
-class LoanListCreateView(APIView):
+
+class LoanDetailView(generics.RetrieveAPIView):
+    """
+    Retrieve a single loan with its tasks expanded.
     """
-    List all loans (N+1 vulnerability) or create a new loan.
 
+    queryset = Loan.objects.prefetch_related("tasks")
+    serializer_class = LoanDetailSerializer
+
+
+class LoanExportView(APIView):
     """
+    Stream every loan as a JSON array without materializing the table.
+    """
+
+    chunk_size = 1000
 
     def get(self, request):
-        loans = Loan.objects.all()  # N+1 + no filtering
-        serializer = LoanSerializer(loans, many=True)
-        return Response(serializer.data)
+        loans = (
+            Loan.objects.prefetch_related(recent_tasks_prefetch())
+            .order_by("id")
+            .iterator(chunk_size=self.chunk_size)
+        )
+        return StreamingHttpResponse(self.stream(loans), content_type="application/json")
+
+    def stream(self, loans):
+        # one serializer instance so the field map is built only once
+        serializer = LoanSerializer()
+        yield "["
+        for i, loan in enumerate(loans):
+            if i:
+                yield ","
+            yield json.dumps(serializer.to_representation(loan), cls=JSONEncoder)
+        yield "]"
+
+
+class LoanBulkTransitionView(APIView):
+    """
+    Move many loans to a new status in one statement.
+
+    Accepts either {"ids": [...], "status": ..., "is_active": ...} to apply
+    the same values to every loan, or a list of
+    {"id", "status", "is_active"} objects for per-loan values.
+    """
+
+    batch_size = 500
 
     def post(self, request):
-        serializer = LoanSerializer(data=request.data)
-        if serializer.is_valid():
-            loan = serializer.save()
-            return Response(serializer.data, status=status.HTTP_201_CREATED)
-        return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+        now = timezone.now()
+
+        if isinstance(request.data, list):
+            serializer = LoanTransitionSerializer(data=request.data, many=True)
+            serializer.is_valid(raise_exception=True)
+            loans = [
+                Loan(id=item["id"], status=item["status"], is_active=item["is_active"], updated_at=now)
+                for item in serializer.validated_data
+            ]
+            # one UPDATE ... CASE WHEN per batch instead of a save() per loan
+            updated = Loan.objects.bulk_update(
+                loans, ["status", "is_active", "updated_at"], batch_size=self.batch_size
+            )
+            return Response({"updated": updated})
+
+        serializer = LoanBulkTransitionSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        data = serializer.validated_data
+        values = {"status": data["status"], "updated_at": now}
+        if "is_active" in data:
+            values["is_active"] = data["is_active"]
+        updated = Loan.objects.filter(id__in=data["ids"]).update(**values)
+        return Response({"updated": updated})
 
 
 class TaskCreateView(APIView):
@@ -31,21 +251,76 @@ class TaskCreateView(APIView):
     """
 
     def post(self, request):
-        loan_id = request.data.get("loan_id")
-        task_type = request.data.get("task_type")
+        serializer = TaskCreateSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        loan_id = serializer.validated_data["loan_id"]
+        task_type = serializer.validated_data["task_type"]
 
-        loan = Loan.objects.get(id=loan_id)
+        with transaction.atomic():
+            # row lock serializes concurrent task creation for this loan only
+            loan = get_object_or_404(Loan.objects.select_for_update(), id=loan_id)
+            # the TaskExecution post_save receiver bumps loan.updated_at
+            task = TaskExecution.objects.create(loan=loan, task_type=task_type)
+            Loan.objects.filter(id=loan.id).update(
+                current_task=task,
+                current_task_type=task.task_type,
+                status="IN_PROGRESS",
+            )
 
-        task = TaskExecution.objects.create(
-            loan=loan,
-            task_type=task_type
-        )
+        return Response({"message": "Task created"})
 
-        loan.current_task = task
-        loan.status = "IN_PROGRESS"
-        loan.save()
 
-        return Response({"message": "Task created"})
+class TaskBulkCreateView(APIView):
+    """
+    Create tasks for many loans in one request.
+
+    Expects a list of {"loan_id", "task_type"} objects. The last task given
+    for a loan becomes its current_task.
+    """
+
+    def post(self, request):
+        serializer = TaskCreateSerializer(data=request.data, many=True)
+        serializer.is_valid(raise_exception=True)
+        items = serializer.validated_data
+
+        loan_ids = {item["loan_id"] for item in items}
+
+        with transaction.atomic():
+            # same row locks TaskCreateView takes, held until the bulk update
+            existing = set(
+                Loan.objects.select_for_update()
+                .filter(id__in=loan_ids)
+                .order_by("id")  # consistent lock order avoids deadlocks
+                .values_list("id", flat=True)
+            )
+            missing = loan_ids - existing
+            if missing:
+                raise NotFound(f"Loans not found: {sorted(missing)}")
+
+            tasks = TaskExecution.objects.bulk_create(
+                [TaskExecution(loan_id=item["loan_id"], task_type=item["task_type"]) for item in items]
+            )
+            current = {task.loan_id: task for task in tasks}
+            now = timezone.now()
+            # bulk_update skips auto_now, so updated_at is set explicitly
+            Loan.objects.bulk_update(
+                [
+                    Loan(
+                        id=loan_id,
+                        current_task=task,
+                        current_task_type=task.task_type,
+                        status="IN_PROGRESS",
+                        updated_at=now,
+                    )
+                    for loan_id, task in current.items()
+                ],
+                ["current_task", "current_task_type", "status", "updated_at"],
+            )
+
+        return Response(
+            {"message": "Tasks created", "task_ids": [task.id for task in tasks]},
+            status=status.HTTP_201_CREATED,
+        )
 
 
 class TaskCompleteView(APIView):
@@ -54,10 +329,18 @@ class TaskCompleteView(APIView):
     """
 
     def post(self, request):
-        task_id = request.data.get("task_id")
-        
-        task = TaskExecution.objects.get(id=task_id)
-        task.is_completed = True
-        task.save()
+        serializer = TaskCompleteSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        task_id = serializer.validated_data["task_id"]
+        now = timezone.now()
+
+        with transaction.atomic():
+            updated = TaskExecution.objects.filter(id=task_id).update(
+                is_completed=True, completed_at=now
+            )
+            if updated == 0:
+                raise NotFound("Task not found.")
+            # recent_tasks in the list body changed, so invalidate its ETag
+            Loan.objects.filter(tasks__id=task_id).update(updated_at=now)
 
         return Response({"message": "Task completed"})